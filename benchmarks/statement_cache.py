@@ -0,0 +1,126 @@
+"""Compare per-lookup cost of fresh vs cached statements for the hot daily_calendars lookup
+
+Usage:
+    python benchmarks/statement_cache.py [--db-url postgresql+psycopg://...] [--iterations 20000]
+
+Defaults to an in-memory SQLite database, which isolates the Python-side cost
+(statement construction, cache key generation, compilation). Against Postgres
+the server's plan + execution time per lookup is also reported, read as a
+pg_stat_statements delta; that needs the extension installed in the target
+database and pg_stat_statements.track_planning = on for plan time to count.
+"""
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+# The package reads its settings on import; the benchmark uses its own engine
+for name in ("JISU_API_KEY", "JUHE_API_KEY", "POSTGRES_USER", "POSTGRES_PASSWORD"):
+    os.environ.setdefault(name, "benchmark")
+
+from sqlalchemy import create_engine, lambda_stmt, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, load_only
+
+from doonook_chinese_calendar.models.calendar import DailyCalendar
+from doonook_chinese_calendar.services.calendar_service import _projected_calendar_query
+
+START = date(2024, 1, 1)
+DAYS = 366
+
+
+def fresh(db: Session, day: date):
+    return db.execute(select(DailyCalendar).where(DailyCalendar.date == day)).scalar_one_or_none()
+
+
+def cached_lambda(db: Session, day: date):
+    return db.execute(lambda_stmt(lambda: select(DailyCalendar).where(DailyCalendar.date == day))).scalar_one_or_none()
+
+
+def fresh_projected(db: Session, day: date):
+    query = select(DailyCalendar).where(DailyCalendar.date == day).options(
+        load_only(DailyCalendar.lunar_date, DailyCalendar.yi, DailyCalendar.ji)
+    )
+    return db.execute(query).scalar_one_or_none()
+
+
+def cached_projected(db: Session, day: date):
+    query = _projected_calendar_query(frozenset({"lunar_date", "yi", "ji"}))
+    return db.execute(query, {"date": day}).scalar_one_or_none()
+
+
+_SERVER_STATS = text(
+    "SELECT coalesce(sum(calls), 0), coalesce(sum(total_plan_time + total_exec_time), 0) "
+    "FROM pg_stat_statements "
+    "WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database()) "
+    "AND query LIKE '%FROM daily_calendars%'"
+)
+
+
+def server_stats(engine) -> Optional[Tuple[int, float]]:
+    """(calls, plan + exec ms) for daily_calendars lookups so far, or None off Postgres"""
+    if engine.dialect.name != "postgresql":
+        return None
+    try:
+        with engine.connect() as conn:
+            calls, total_ms = conn.execute(_SERVER_STATS).one()
+    except DBAPIError:
+        return None
+    return int(calls), float(total_ms)
+
+
+def run(engine, lookup, iterations: int) -> Tuple[float, Optional[float]]:
+    """Client CPU µs per lookup, and server plan + exec µs per lookup when available"""
+    with Session(engine) as db:
+        # Warm up the compiled cache and, on Postgres, the prepared statement
+        for i in range(50):
+            lookup(db, START + timedelta(days=i % DAYS))
+        db.expunge_all()
+        db.commit()
+        before = server_stats(engine)
+        started = time.process_time()
+        for i in range(iterations):
+            lookup(db, START + timedelta(days=i % DAYS))
+            db.expunge_all()
+        cpu = (time.process_time() - started) / iterations * 1e6
+    after = server_stats(engine)
+    if before is None or after is None or after[0] == before[0]:
+        return cpu, None
+    return cpu, (after[1] - before[1]) / iterations * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite://")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    if args.db_url.startswith("sqlite"):
+        DailyCalendar.__table__.create(engine)
+        with Session(engine) as db:
+            db.add_all(
+                DailyCalendar(date=START + timedelta(days=i), lunar_date="正月初一", yi="{祭祀,出行}", ji="{动土}")
+                for i in range(DAYS)
+            )
+            db.commit()
+
+    if engine.dialect.name == "postgresql" and server_stats(engine) is None:
+        print("pg_stat_statements is not available; reporting client CPU only")
+
+    for label, lookup in (
+        ("fresh select", fresh),
+        ("lambda_stmt", cached_lambda),
+        ("fresh projected select", fresh_projected),
+        ("cached projected select", cached_projected),
+    ):
+        cpu, server = run(engine, lookup, args.iterations)
+        line = f"{label:<26}{cpu:8.1f} µs CPU per lookup"
+        if server is not None:
+            line += f"{server:8.1f} µs server plan + exec"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
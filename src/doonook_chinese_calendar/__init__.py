@@ -1,12 +1,27 @@
 from fastapi import APIRouter
+from fastapi.routing import APIRoute, request_response
 from .api.endpoints import router as calendar_router
 from .api.astro_endpoints import router as astro_router
 from .core.config import CalendarSettings
-from typing import Optional
+from .core.profiling import profiling_route_class
+from .services.calendar_service import shutdown_bazi_pool
+from typing import Optional, Type
+import copy
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _profiled_copy(source: APIRouter, route_class: Type[APIRoute]) -> APIRouter:
+    """Copy of `source` whose API routes use `route_class`; `source` is left untouched"""
+    profiled = APIRouter()
+    for route in source.routes:
+        if isinstance(route, APIRoute):
+            route = copy.copy(route)
+            route.__class__ = route_class
+            route.app = request_response(route.get_route_handler())
+        profiled.routes.append(route)
+    return profiled
+
 def create_calendar_router(
     settings: Optional[CalendarSettings] = None,
     prefix: str = "/api/v1/calendar",
@@ -21,8 +36,18 @@ def create_calendar_router(
     if settings is None:
         settings = CalendarSettings()
     
+    routers = (calendar_router, astro_router)
+    if settings.PROFILING_ENABLED:
+        route_class = profiling_route_class(settings)
+        routers = tuple(_profiled_copy(source, route_class) for source in routers)
+        swapped = sum(isinstance(route, route_class) for source in routers for route in source.routes)
+        if not swapped:
+            raise RuntimeError("PROFILING_ENABLED is set but no calendar routes could be profiled")
+        logger.info(f"Request profiling enabled for {swapped} calendar routes")
+
     router = APIRouter(prefix=prefix)
-    router.include_router(calendar_router)
-    router.include_router(astro_router)
+    for source in routers:
+        router.include_router(source)
+    router.add_event_handler("shutdown", shutdown_bazi_pool)
     
     return router
@@ -5,7 +5,9 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from datetime import date
 from ..services.astro_service import AstroService
-from typing import List
+from ..core.rate_limit import QuotaExceededError
+from typing import List, Optional
+from ..core.locales import Language
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -14,12 +16,14 @@ router = APIRouter()
 astro_service = AstroService()
 
 @router.get("/astro/{astroid}", response_model=AstroFortuneSchema)
-async def get_daily_fortune(astroid: int, date: date = date.today(), db: Session = Depends(get_db)):
+async def get_daily_fortune(astroid: int, date: date = date.today(), lang: Optional[Language] = None, db: Session = Depends(get_db)):
     try:
-        fortune = await astro_service.get_daily_fortune(astroid, date, db)
+        fortune = await astro_service.get_daily_fortune(astroid, date, db, lang=lang)
         if not fortune:
             raise HTTPException(status_code=404, detail="Fortune not found for today")
         return fortune
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1,51 +1,170 @@
-from ..schemas.calendar import DailyCalendarInfoSchema
-from ..core.database import get_db
-from fastapi import APIRouter, HTTPException, Depends
+from ..schemas.calendar import DailyCalendarInfoSchema, FourPillarsRequest, FourPillarsSchema, MonthCalendarDaySchema, MonthCalendarSchema
+from ..core.database import get_db, SessionLocal
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date as date_type, datetime, timedelta
 from ..services.calendar_service import ChineseCalendarService
-from typing import Optional
+from ..core.config import settings
+from ..core.rate_limit import QuotaExceededError, quota_usage
+from ..core.locales import Language
+from typing import Iterator, List, Optional, Set
+import hmac
+import json
 
 router = APIRouter()
 calendar_service = ChineseCalendarService()
 
+def _parse_fields(fields: Optional[str], allowed) -> Optional[Set[str]]:
+    """Parse a comma-separated `fields=` projection, rejecting unknown names"""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
 @router.get("/daily",response_model=DailyCalendarInfoSchema)
-async def get_daily_calendar(date: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_daily_calendar(date: Optional[str] = None, fields: Optional[str] = None, lang: Optional[Language] = None, db: Session = Depends(get_db)):
+    field_set = _parse_fields(fields, DailyCalendarInfoSchema.model_fields)
     try:
         if date:
             query_date = datetime.strptime(date, "%Y-%m-%d")
         else:
             query_date = datetime.now()
             
-        return await calendar_service.get_daily_calendar(query_date,db)
+        result = await calendar_service.get_daily_calendar(query_date, db, field_set, lang=lang)
+        if field_set:
+            # Sparse results don't satisfy the full response model
+            return JSONResponse(content=jsonable_encoder(result))
+        return result
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/convert-to-lunar")
-async def convert_to_lunar(date: Optional[str] = None):
+async def convert_to_lunar(date: Optional[str] = None, lang: Optional[Language] = None):
     try:
         if date:
             query_date = datetime.strptime(date, "%Y-%m-%d")
         else:
             query_date = datetime.now()
             
-        return calendar_service.convert_to_lunar(query_date)
+        return calendar_service.convert_to_lunar(query_date, lang)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get-holidays")
-async def get_holidays(start_date: str, end_date: str):
+async def get_holidays(start_date: str, end_date: str, lang: Optional[Language] = None):
     try:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
             
             
-        return calendar_service.get_holidays(start_date, end_date)
+        return calendar_service.get_holidays(start_date, end_date, lang)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/quota-usage")
+async def get_quota_usage(x_doonook_admin_token: Optional[str] = Header(None)):
+    """Today's upstream API calls per provider against their daily quotas"""
+    # Operational counters; hidden unless QUOTA_USAGE_TOKEN is configured and sent
+    token = settings.QUOTA_USAGE_TOKEN
+    if not token or x_doonook_admin_token is None or not hmac.compare_digest(x_doonook_admin_token.encode(), token.encode()):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return await quota_usage()
+
+@router.get("/month/{year}/{month}", response_model=MonthCalendarSchema, response_model_exclude_unset=True)
+async def get_month_calendar(year: int, month: int, fields: Optional[str] = None, lang: Optional[Language] = None, db: Session = Depends(get_db)):
+    field_set = _parse_fields(fields, MonthCalendarDaySchema.model_fields)
+    try:
+        return await calendar_service.get_month_calendar(year, month, db, field_set, lang)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/bazi", response_model=List[FourPillarsSchema])
+async def get_four_pillars(request: FourPillarsRequest, lang: Optional[Language] = None):
+    try:
+        return await calendar_service.get_four_pillars_batch(request.datetimes, lang)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export")
+async def export_calendar(start_date: str, end_date: str, lang: Optional[Language] = None):
+    """Stream every day in the range as NDJSON, one calendar object per line"""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
+    def generate() -> Iterator[str]:
+        # The response outlives request dependencies, so the stream owns its session
+        db = SessionLocal()
+        try:
+            for item in calendar_service.iter_calendar_range(start, end, db, lang):
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+def _ics_response(content: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="text/calendar; charset=utf-8", headers=headers)
+
+@router.get("/ics/upcoming.ics")
+async def get_upcoming_ics(
+    months: int = Query(12, ge=1, le=36),
+    lunar: bool = True,
+    solar_terms: bool = True,
+    holidays: bool = True,
+    lang: Optional[Language] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Rolling feed from the start of last month; the window only moves monthly so it stays cached"""
+    today = date_type.today()
+    start = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+    end_index = start.year * 12 + start.month - 1 + months
+    end = date_type(end_index // 12, end_index % 12 + 1, 1) - timedelta(days=1)
+    try:
+        content, etag = calendar_service.get_ics_feed(start, end, lunar, solar_terms, holidays, lang)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _ics_response(content, etag, if_none_match)
+
+@router.get("/ics/{year}.ics")
+async def get_year_ics(
+    year: int,
+    lunar: bool = True,
+    solar_terms: bool = True,
+    holidays: bool = True,
+    lang: Optional[Language] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    if not 1900 <= year <= 2100:
+        raise HTTPException(status_code=400, detail="Year must be between 1900 and 2100")
+    try:
+        content, etag = calendar_service.get_ics_feed(
+            date_type(year, 1, 1), date_type(year, 12, 31), lunar, solar_terms, holidays, lang
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return _ics_response(content, etag, if_none_match)
@@ -1,8 +1,11 @@
 import click
 from alembic import command
 from alembic.config import Config
+from datetime import date
 from pathlib import Path
+from sqlalchemy import create_engine
 from .core.config import settings
+from .core import partitions
 
 @click.group()
 def cli():
@@ -32,5 +35,33 @@ def migrate(revision, db_url):
     command.upgrade(alembic_cfg, revision)
     click.echo("Migration complete!")
 
+@cli.command('prune-fortunes')
+@click.option('--keep-months', default=12, show_default=True, help='Months of astro fortunes to keep, including the current one')
+@click.option('--premake-months', default=3, show_default=True, help='Upcoming monthly partitions to create ahead of time')
+@click.option('--dry-run', is_flag=True, help='Only list the partitions that would be dropped')
+@click.option('--db-url', help='Database URL (overrides settings)')
+def prune_fortunes(keep_months, premake_months, dry_run, db_url):
+    """Drop astro_fortunes partitions past retention and create upcoming ones"""
+    if keep_months < 1:
+        raise click.BadParameter('must be at least 1', param_hint='--keep-months')
+
+    today = date.today()
+    cutoff = partitions.add_months(date(today.year, today.month, 1), 1 - keep_months)
+    engine = create_engine(db_url or settings.DATABASE_URL)
+    with engine.begin() as conn:
+        if dry_run:
+            stale = [name for name in partitions.list_partitions(conn) if name < partitions.partition_name(cutoff)]
+            click.echo(f"Would drop {len(stale)} partition(s) before {cutoff}: {', '.join(stale) or '-'}")
+            return
+
+        created = partitions.create_partitions(conn, today, premake_months + 1)
+        click.echo(f"Ensured partitions: {', '.join(created)}")
+        dropped = partitions.drop_partitions_before(conn, cutoff)
+        click.echo(f"Dropped {len(dropped)} partition(s) before {cutoff}: {', '.join(dropped) or '-'}")
+        pruned = partitions.prune_default_partition(conn, cutoff)
+        click.echo(f"Deleted {pruned} row(s) before {cutoff} from {partitions.DEFAULT_PARTITION}")
+        removed = partitions.delete_orphaned_contents(conn)
+        click.echo(f"Removed {removed} unreferenced fortune content row(s)")
+
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
@@ -1,7 +1,8 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from .config import CalendarSettings
+import itertools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,42 @@ engine = create_engine(
     pool_timeout=30
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+replica_engines = [
+    create_engine(
+        url,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a read replica and everything else to the primary
+
+    Each session is pinned to one replica, picked round-robin. Once the session
+    writes, all of its later statements go to the primary so it reads its own writes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = next(_replica_cycle) if _replica_cycle else None
+        self.use_primary = self.replica is None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.use_primary:
+            return engine
+        # is_select rather than isinstance(Select): lambda_stmt() lookups are
+        # StatementLambdaElements wrapping a select
+        if self._flushing or (clause is not None and not getattr(clause, "is_select", False)):
+            self.use_primary = True
+            return engine
+        return self.replica
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -24,4 +60,15 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def switch_to_primary(db: Session) -> bool:
+    """Route the session's remaining statements to the primary
+
+    Returns False if it was already reading from the primary, so callers only
+    repeat a lookup when the first attempt may have hit a lagging replica.
+    """
+    if not isinstance(db, RoutingSession) or db.use_primary:
+        return False
+    db.use_primary = True
+    return True
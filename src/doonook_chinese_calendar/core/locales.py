@@ -0,0 +1,148 @@
+from typing import Dict, List, Literal, Optional
+from .config import settings
+import sys
+
+# Rows in daily_calendars and astro_fortunes are always stored in this locale
+STORAGE_LANGUAGE = "zh_CN"
+
+_TABLES = {
+    "zh_CN": {
+        "gan": ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"],
+        "zhi": ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"],
+        "shengxiao": ["鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪"],
+        "solar_terms": ["冬至", "小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨", "立夏",
+                        "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑", "白露", "秋分", "寒露",
+                        "霜降", "立冬", "小雪", "大雪"],
+        "months": ["正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "十一", "十二"],
+        "days": ["初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十",
+                 "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十",
+                 "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十"],
+        "festivals": {
+            "New Year's Day": "元旦",
+            "Spring Festival": "春节",
+            "Tomb-sweeping Day": "清明节",
+            "Labour Day": "劳动节",
+            "Dragon Boat Festival": "端午节",
+            "National Day": "国庆节",
+            "Mid-autumn Festival": "中秋节",
+        },
+        "astro": {
+            1: "白羊座", 2: "金牛座", 3: "双子座", 4: "巨蟹座", 5: "狮子座", 6: "处女座",
+            7: "天秤座", 8: "天蝎座", 9: "射手座", 10: "摩羯座", 11: "水瓶座", 12: "双鱼座",
+        },
+        "ganzhi_format": "{gan}{zhi}",
+        "lunar_date_format": "{leap}{month}月{day}",
+        "leap": "闰",
+        "calendar_name": "农历",
+    },
+    "zh_TW": {
+        "gan": ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"],
+        "zhi": ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"],
+        "shengxiao": ["鼠", "牛", "虎", "兔", "龍", "蛇", "馬", "羊", "猴", "雞", "狗", "豬"],
+        "solar_terms": ["冬至", "小寒", "大寒", "立春", "雨水", "驚蟄", "春分", "清明", "穀雨", "立夏",
+                        "小滿", "芒種", "夏至", "小暑", "大暑", "立秋", "處暑", "白露", "秋分", "寒露",
+                        "霜降", "立冬", "小雪", "大雪"],
+        "months": ["正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "十一", "十二"],
+        "days": ["初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十",
+                 "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十",
+                 "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十"],
+        "festivals": {
+            "New Year's Day": "元旦",
+            "Spring Festival": "春節",
+            "Tomb-sweeping Day": "清明節",
+            "Labour Day": "勞動節",
+            "Dragon Boat Festival": "端午節",
+            "National Day": "國慶節",
+            "Mid-autumn Festival": "中秋節",
+        },
+        "astro": {
+            1: "白羊座", 2: "金牛座", 3: "雙子座", 4: "巨蟹座", 5: "獅子座", 6: "處女座",
+            7: "天秤座", 8: "天蠍座", 9: "射手座", 10: "摩羯座", 11: "水瓶座", 12: "雙魚座",
+        },
+        "ganzhi_format": "{gan}{zhi}",
+        "lunar_date_format": "{leap}{month}月{day}",
+        "leap": "閏",
+        "calendar_name": "農曆",
+    },
+    "en": {
+        "gan": ["Jia", "Yi", "Bing", "Ding", "Wu", "Ji", "Geng", "Xin", "Ren", "Gui"],
+        "zhi": ["Zi", "Chou", "Yin", "Mao", "Chen", "Si", "Wu", "Wei", "Shen", "You", "Xu", "Hai"],
+        "shengxiao": ["Rat", "Ox", "Tiger", "Rabbit", "Dragon", "Snake", "Horse", "Goat", "Monkey",
+                      "Rooster", "Dog", "Pig"],
+        "solar_terms": ["Winter Solstice", "Minor Cold", "Major Cold", "Start of Spring", "Rain Water",
+                        "Awakening of Insects", "Spring Equinox", "Pure Brightness", "Grain Rain",
+                        "Start of Summer", "Grain Buds", "Grain in Ear", "Summer Solstice", "Minor Heat",
+                        "Major Heat", "Start of Autumn", "End of Heat", "White Dew", "Autumn Equinox",
+                        "Cold Dew", "Frost's Descent", "Start of Winter", "Minor Snow", "Major Snow"],
+        "months": [str(month) for month in range(1, 13)],
+        "days": [str(day) for day in range(1, 31)],
+        "festivals": {
+            "New Year's Day": "New Year's Day",
+            "Spring Festival": "Spring Festival",
+            "Tomb-sweeping Day": "Tomb-sweeping Day",
+            "Labour Day": "Labour Day",
+            "Dragon Boat Festival": "Dragon Boat Festival",
+            "National Day": "National Day",
+            "Mid-autumn Festival": "Mid-autumn Festival",
+        },
+        "astro": {
+            1: "Aries", 2: "Taurus", 3: "Gemini", 4: "Cancer", 5: "Leo", 6: "Virgo",
+            7: "Libra", 8: "Scorpio", 9: "Sagittarius", 10: "Capricorn", 11: "Aquarius", 12: "Pisces",
+        },
+        # Pinyin ganzhi are written as one word, e.g. "Jiachen"
+        "ganzhi_format": "{gan}{zhi_lower}",
+        "lunar_date_format": "{leap}Month {month} Day {day}",
+        "leap": "Leap ",
+        "calendar_name": "Chinese Lunar Calendar",
+    },
+}
+
+
+class CalendarLocale:
+    """Label tables for one language, precomputed and interned once at import"""
+
+    def __init__(self, language: str, tables: dict):
+        intern = sys.intern
+        self.language = language
+        self.gan: List[str] = [intern(label) for label in tables["gan"]]
+        self.zhi: List[str] = [intern(label) for label in tables["zhi"]]
+        self.shengxiao: List[str] = [intern(label) for label in tables["shengxiao"]]
+        self.solar_terms: List[str] = [intern(label) for label in tables["solar_terms"]]
+        self.months: List[str] = [intern(label) for label in tables["months"]]
+        self.days: List[str] = [intern(label) for label in tables["days"]]
+        self.festivals: Dict[str, str] = {name: intern(label) for name, label in tables["festivals"].items()}
+        self.astro: Dict[int, str] = {astroid: intern(label) for astroid, label in tables["astro"].items()}
+        self.calendar_name = intern(tables["calendar_name"])
+        # Names indexed by [tg][dz]; only the 60 甲子 combinations occur
+        self.ganzhi: List[List[str]] = [
+            [intern(tables["ganzhi_format"].format(gan=gan, zhi=zhi, zhi_lower=zhi.lower())) for zhi in self.zhi]
+            for gan in self.gan
+        ]
+        # Every lunar date label, indexed by [is_leap][month - 1][day - 1]
+        self.lunar_dates: List[List[List[str]]] = [
+            [
+                [
+                    intern(tables["lunar_date_format"].format(leap=tables["leap"] if leap else "", month=month, day=day))
+                    for day in self.days
+                ]
+                for month in self.months
+            ]
+            for leap in (False, True)
+        ]
+
+
+LOCALES: Dict[str, CalendarLocale] = {
+    language: CalendarLocale(language, tables) for language, tables in _TABLES.items()
+}
+SUPPORTED_LANGUAGES = tuple(LOCALES)
+# For validating `lang` query parameters
+Language = Literal["zh_CN", "zh_TW", "en"]
+
+
+def get_locale(language: Optional[str] = None) -> CalendarLocale:
+    """Locale for `language`, defaulting to settings.LANGUAGE"""
+    language = language or settings.LANGUAGE
+    try:
+        return LOCALES[language]
+    except KeyError:
+        raise ValueError(f"Unsupported language: {language} (expected one of {', '.join(SUPPORTED_LANGUAGES)})")
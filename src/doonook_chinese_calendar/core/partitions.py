@@ -0,0 +1,109 @@
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from typing import List
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+ASTRO_FORTUNES_TABLE = "astro_fortunes"
+# Monthly partitions are named astro_fortunes_YYYYMM
+DEFAULT_PARTITION = f"{ASTRO_FORTUNES_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{ASTRO_FORTUNES_TABLE}_(\d{{4}})(\d{{2}})$")
+
+
+def add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"{ASTRO_FORTUNES_TABLE}_{month_start.year}{month_start.month:02d}"
+
+
+def list_partitions(conn: Connection) -> List[str]:
+    """Names of the monthly partitions currently attached to astro_fortunes"""
+    rows = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :table"
+    ), {"table": ASTRO_FORTUNES_TABLE})
+    return sorted(row[0] for row in rows if _PARTITION_NAME.match(row[0]))
+
+
+def _has_default_partition(conn: Connection) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar()
+
+
+def create_partitions(conn: Connection, start: date, months: int) -> List[str]:
+    """Create monthly partitions for `months` months starting at the month of `start`
+
+    Rows that already landed in the default partition for a new month are moved
+    into it; otherwise Postgres refuses to create the partition.
+    """
+    existing = set(list_partitions(conn))
+    has_default = _has_default_partition(conn)
+    created = []
+    month_start = date(start.year, start.month, 1)
+    for _ in range(months):
+        month_end = add_months(month_start, 1)
+        name = partition_name(month_start)
+        created.append(name)
+        if name in existing:
+            month_start = month_end
+            continue
+
+        bounds = {"start": month_start, "end": month_end}
+        stranded = has_default and conn.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end)"
+        ), bounds).scalar()
+        if stranded:
+            conn.execute(text(f"ALTER TABLE {ASTRO_FORTUNES_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {ASTRO_FORTUNES_TABLE} "
+            f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+        ))
+        if stranded:
+            moved = conn.execute(text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *) "
+                f"INSERT INTO {ASTRO_FORTUNES_TABLE} SELECT * FROM moved"
+            ), bounds).rowcount
+            conn.execute(text(f"ALTER TABLE {ASTRO_FORTUNES_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+            logger.info(f"Moved {moved} row(s) from {DEFAULT_PARTITION} into {name}")
+        month_start = month_end
+    return created
+
+
+def drop_partitions_before(conn: Connection, cutoff: date) -> List[str]:
+    """Drop partitions that only hold dates before the month of `cutoff`"""
+    cutoff_month = date(cutoff.year, cutoff.month, 1)
+    dropped = []
+    for name in list_partitions(conn):
+        match = _PARTITION_NAME.match(name)
+        month_start = date(int(match.group(1)), int(match.group(2)), 1)
+        if month_start < cutoff_month:
+            conn.execute(text(f"DROP TABLE {name}"))
+            logger.info(f"Dropped partition {name}")
+            dropped.append(name)
+    return dropped
+
+
+def prune_default_partition(conn: Connection, cutoff: date) -> int:
+    """Delete rows before the month of `cutoff` that were caught by the default partition"""
+    if not _has_default_partition(conn):
+        return 0
+    cutoff_month = date(cutoff.year, cutoff.month, 1)
+    result = conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE date < :cutoff"), {"cutoff": cutoff_month})
+    return result.rowcount
+
+
+def delete_orphaned_contents(conn: Connection) -> int:
+    """Remove shared fortune text no longer referenced by any remaining fortune"""
+    result = conn.execute(text(
+        "DELETE FROM astro_fortune_contents c WHERE NOT EXISTS ("
+        f"SELECT 1 FROM {ASTRO_FORTUNES_TABLE} f "
+        "WHERE c.hash IN (f.year_hash, f.month_hash, f.week_hash))"
+    ))
+    return result.rowcount
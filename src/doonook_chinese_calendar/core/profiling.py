@@ -0,0 +1,108 @@
+from datetime import datetime
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pathlib import Path
+from typing import Callable, Dict, Optional, Type
+from .config import CalendarSettings
+import hmac
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Doonook-Profile"
+
+# Time is attributed to the innermost frame matching one of these, checked in order
+_CATEGORIES = (
+    ("calendar_service", "services/calendar_service"),
+    ("astro_service", "services/astro_service"),
+    ("db", "sqlalchemy"),
+    ("db", "psycopg"),
+    ("upstream_http", "httpx"),
+    ("upstream_http", "httpcore"),
+)
+
+
+def _category(file_path: Optional[str]) -> Optional[str]:
+    if not file_path:
+        return None
+    path = file_path.replace("\\", "/")
+    for name, marker in _CATEGORIES:
+        if marker in path:
+            return name
+    return None
+
+
+def summarize(root_frame) -> Dict[str, float]:
+    """Seconds spent per category in a pyinstrument frame tree"""
+    totals: Dict[str, float] = {}
+    stack = [(root_frame, "other")]
+    while stack:
+        frame, inherited = stack.pop()
+        category = _category(frame.file_path) or inherited
+        # total_self_time already covers the synthetic [self]/[await] children
+        totals[category] = totals.get(category, 0.0) + frame.total_self_time
+        stack.extend((child, category) for child in frame.children if not child.is_synthetic)
+    return totals
+
+
+class ProfilingRoute(APIRoute):
+    """Route that profiles requests carrying the configured X-Doonook-Profile token
+
+    Other requests go straight to the normal handler. Profiled responses get
+    X-Profile-* headers with a per-category breakdown; the full report is
+    written to PROFILING_OUTPUT_DIR when set, otherwise logged. Use
+    profiling_route_class() to get a subclass bound to settings.
+    """
+
+    settings: CalendarSettings
+
+    def get_route_handler(self) -> Callable:
+        from pyinstrument import Profiler
+
+        handler = super().get_route_handler()
+        token = self.settings.PROFILING_TOKEN.encode()
+        interval = self.settings.PROFILING_INTERVAL
+        output_dir = Path(self.settings.PROFILING_OUTPUT_DIR) if self.settings.PROFILING_OUTPUT_DIR else None
+
+        async def profiled_handler(request: Request) -> Response:
+            requested = request.headers.get(PROFILE_HEADER)
+            if requested is None or not hmac.compare_digest(requested.encode(), token):
+                return await handler(request)
+
+            profiler = Profiler(interval=interval, async_mode="enabled")
+            profiler.start()
+            try:
+                response = await handler(request)
+            finally:
+                profiler.stop()
+
+            session = profiler.last_session
+            root_frame = session.root_frame()
+            totals = summarize(root_frame) if root_frame else {}
+            response.headers["X-Profile-Total-Ms"] = f"{session.duration * 1000:.1f}"
+            response.headers["X-Profile-Breakdown"] = "; ".join(
+                f"{name}={seconds * 1000:.1f}ms" for name, seconds in sorted(totals.items(), key=lambda item: -item[1])
+            )
+            if output_dir is None:
+                logger.info(f"Profile for {request.method} {request.url.path}:\n{profiler.output_text()}")
+            else:
+                slug = re.sub(r"[^A-Za-z0-9]+", "-", request.url.path).strip("-")
+                name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{request.method.lower()}-{slug}.html"
+                output_dir.mkdir(parents=True, exist_ok=True)
+                (output_dir / name).write_text(profiler.output_html(), encoding="utf-8")
+                response.headers["X-Profile-Report"] = name
+            return response
+
+        return profiled_handler
+
+
+def profiling_route_class(settings: CalendarSettings) -> Type[ProfilingRoute]:
+    """ProfilingRoute subclass bound to `settings`, checked up front"""
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError as e:
+        raise ImportError("PROFILING_ENABLED requires the 'pyinstrument' package (pip install doonook-chinese-calendar[profiling])") from e
+    if not settings.PROFILING_TOKEN:
+        raise ValueError("PROFILING_ENABLED requires PROFILING_TOKEN to be set")
+    return type("BoundProfilingRoute", (ProfilingRoute,), {"settings": settings})
@@ -0,0 +1,209 @@
+from datetime import datetime
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from .config import settings
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Lower values are served first"""
+    USER = 0        # A request is waiting on this call
+    BACKGROUND = 1  # Backfill / prewarm traffic
+
+
+class QuotaExceededError(Exception):
+    """The provider's daily call quota is used up; not a client error"""
+    pass
+
+
+# Token bucket in Redis so every worker draws from the same budget.
+# Returns the seconds to wait before a token is available (0 when one was taken).
+_REDIS_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+# Counts one call against the daily quota and undoes it when that goes over,
+# so concurrent workers can never both take the last call.
+# A quota of -1 means unlimited. Returns the new count, or -1 when the quota
+# was already exhausted.
+_REDIS_CONSUME_SCRIPT = """
+local quota = tonumber(ARGV[1])
+local used = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+if quota >= 0 and used > quota then
+    redis.call('DECR', KEYS[1])
+    return -1
+end
+return used
+"""
+_USAGE_TTL_SECONDS = 2 * 24 * 3600
+
+
+class LocalBucketBackend:
+    """Per-process token buckets and usage counters"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._usage: Dict[Tuple[str, str], int] = {}
+
+    async def take(self, name: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(name, (float(burst), now))
+        tokens = min(burst, tokens + (now - ts) * rate)
+        if tokens >= 1:
+            self._buckets[name] = (tokens - 1, now)
+            return 0.0
+        self._buckets[name] = (tokens, now)
+        return (1 - tokens) / rate
+
+    async def used(self, name: str, day: str) -> int:
+        return self._usage.get((name, day), 0)
+
+    async def consume(self, name: str, day: str, quota: Optional[int]) -> Optional[int]:
+        key = (name, day)
+        used = self._usage.get(key, 0)
+        if quota is not None and used >= quota:
+            return None
+        self._usage[key] = used + 1
+        return used + 1
+
+    async def refund(self, name: str, day: str) -> None:
+        key = (name, day)
+        self._usage[key] = max(0, self._usage.get(key, 0) - 1)
+
+
+class RedisBucketBackend:
+    """Token buckets and usage counters shared by all workers through Redis"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("RATE_LIMIT_REDIS_URL requires the 'redis' package") from e
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE_SCRIPT)
+        self._consume = self._client.register_script(_REDIS_CONSUME_SCRIPT)
+
+    async def take(self, name: str, rate: float, burst: int) -> float:
+        return float(await self._take(keys=[f"ratelimit:{name}:bucket"], args=[rate, burst]))
+
+    async def used(self, name: str, day: str) -> int:
+        return int(await self._client.get(f"ratelimit:{name}:used:{day}") or 0)
+
+    async def consume(self, name: str, day: str, quota: Optional[int]) -> Optional[int]:
+        used = int(await self._consume(keys=[f"ratelimit:{name}:used:{day}"], args=[-1 if quota is None else quota, _USAGE_TTL_SECONDS]))
+        return None if used < 0 else used
+
+    async def refund(self, name: str, day: str) -> None:
+        await self._client.decr(f"ratelimit:{name}:used:{day}")
+
+
+class RateLimiter:
+    """Token bucket for one upstream provider with priority-ordered waiters
+
+    Waiters are served strictly by (priority, arrival) within this process, so a
+    user-facing call overtakes queued background calls at the next free token.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, daily_quota: Optional[int] = None, backend=None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.backend = backend or LocalBucketBackend()
+        self._waiters: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+
+    def _quota_day(self) -> str:
+        # Provider quotas reset at local midnight
+        return datetime.now(ZoneInfo(settings.TIMEZONE)).strftime("%Y%m%d")
+
+    async def acquire(self, priority: Priority = Priority.USER) -> None:
+        day = self._quota_day()
+        # Reserve the call against the quota up front; a waiter that never gets
+        # its token (cancelled, timed out) hands the reservation back
+        used = await self.backend.consume(self.name, day, self.daily_quota)
+        if used is None:
+            raise QuotaExceededError(f"Daily quota of {self.daily_quota} calls to {self.name} exhausted")
+        logger.debug(f"{self.name} quota usage {used}/{self.daily_quota or '-'}")
+
+        ticket = (int(priority), next(self._counter))
+        heapq.heappush(self._waiters, ticket)
+        acquired = False
+        try:
+            while True:
+                if self._waiters[0] != ticket:
+                    changed = self._changed
+                    await changed.wait()
+                    continue
+                wait = await self.backend.take(self.name, self.rate, self.burst)
+                if wait == 0:
+                    acquired = True
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            # Wake the others so the new head of the queue claims the next token
+            self._changed.set()
+            self._changed = asyncio.Event()
+            if not acquired:
+                await asyncio.shield(self.backend.refund(self.name, day))
+
+    async def usage(self) -> Dict[str, Optional[int]]:
+        return {
+            "used": await self.backend.used(self.name, self._quota_day()),
+            "daily_quota": self.daily_quota,
+            "waiting": len(self._waiters),
+        }
+
+
+_backend = None
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_limiter(provider: str) -> RateLimiter:
+    """Shared limiter for `provider` ("jisu" or "juhe"), configured from settings"""
+    global _backend
+    if provider not in _limiters:
+        if _backend is None:
+            _backend = RedisBucketBackend(settings.RATE_LIMIT_REDIS_URL) if settings.RATE_LIMIT_REDIS_URL else LocalBucketBackend()
+        prefix = provider.upper()
+        rate = getattr(settings, f"{prefix}_RATE_PER_SECOND")
+        _limiters[provider] = RateLimiter(
+            provider,
+            rate=rate,
+            burst=max(1, math.ceil(rate)),
+            daily_quota=getattr(settings, f"{prefix}_DAILY_QUOTA"),
+            backend=_backend,
+        )
+    return _limiters[provider]
+
+
+async def quota_usage() -> Dict[str, Dict[str, Optional[int]]]:
+    return {provider: await get_limiter(provider).usage() for provider in ("jisu", "juhe")}
@@ -0,0 +1,166 @@
+"""Partition astro_fortunes by month and deduplicate period fortunes
+
+Revision ID: b1f4c2d8a9e3
+Revises: 75c3add9cb65
+Create Date: 2025-03-18 21:12:04.513377
+
+"""
+from datetime import date
+from typing import Sequence, Union
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f4c2d8a9e3'
+down_revision: Union[str, None] = '75c3add9cb65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of the current month
+PREMAKE_MONTHS = 3
+COPY_BATCH_SIZE = 1000
+
+
+def _content_hash(content) -> str:
+    # Must match models.astro.content_hash
+    canonical = json.dumps(content or {}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _month_starts(first: date, last: date):
+    month_start = date(first.year, first.month, 1)
+    while month_start <= last:
+        yield month_start
+        index = month_start.year * 12 + month_start.month
+        month_start = date(index // 12, index % 12 + 1, 1)
+
+
+def _create_month_partition(month_start: date) -> None:
+    index = month_start.year * 12 + month_start.month
+    month_end = date(index // 12, index % 12 + 1, 1)
+    op.execute(
+        f"CREATE TABLE astro_fortunes_{month_start.year}{month_start.month:02d} PARTITION OF astro_fortunes "
+        f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.create_table('astro_fortune_contents',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('content', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('hash')
+    )
+
+    op.drop_index('ix_astro_fortunes_astroid', table_name='astro_fortunes')
+    op.drop_index('ix_astro_fortunes_date', table_name='astro_fortunes')
+    op.drop_index('ix_astro_fortunes_id', table_name='astro_fortunes')
+    op.rename_table('astro_fortunes', 'astro_fortunes_legacy')
+    op.execute('ALTER TABLE astro_fortunes_legacy RENAME CONSTRAINT astro_fortunes_pkey TO astro_fortunes_legacy_pkey')
+    op.execute('ALTER SEQUENCE astro_fortunes_id_seq RENAME TO astro_fortunes_legacy_id_seq')
+
+    op.create_table('astro_fortunes',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('astroid', sa.Integer(), nullable=True),
+    sa.Column('astroname', sa.String(), nullable=True),
+    sa.Column('year_hash', sa.String(length=64), nullable=True),
+    sa.Column('month_hash', sa.String(length=64), nullable=True),
+    sa.Column('week_hash', sa.String(length=64), nullable=True),
+    sa.Column('today', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('tomorrow', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.ForeignKeyConstraint(['year_hash'], ['astro_fortune_contents.hash'], ),
+    sa.ForeignKeyConstraint(['month_hash'], ['astro_fortune_contents.hash'], ),
+    sa.ForeignKeyConstraint(['week_hash'], ['astro_fortune_contents.hash'], ),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    sa.UniqueConstraint('astroid', 'date', name='uq_astro_fortunes_astroid_date'),
+    postgresql_partition_by='RANGE (date)'
+    )
+
+    # Partitions for every month with data up to a few months ahead, plus a
+    # default partition so inserts never fail if maintenance falls behind
+    today = date.today()
+    first_date = conn.execute(sa.text('SELECT min(date) FROM astro_fortunes_legacy')).scalar() or today
+    last_month_index = today.year * 12 + today.month - 1 + PREMAKE_MONTHS
+    for month_start in _month_starts(first_date, date(last_month_index // 12, last_month_index % 12 + 1, 1)):
+        _create_month_partition(month_start)
+    op.execute('CREATE TABLE astro_fortunes_default PARTITION OF astro_fortunes DEFAULT')
+
+    contents = sa.table('astro_fortune_contents', sa.column('hash'), sa.column('content', postgresql.JSONB))
+    fortunes = sa.table(
+        'astro_fortunes',
+        sa.column('id'), sa.column('date'), sa.column('astroid'), sa.column('astroname'),
+        sa.column('year_hash'), sa.column('month_hash'), sa.column('week_hash'),
+        sa.column('today', postgresql.JSONB), sa.column('tomorrow', postgresql.JSONB),
+    )
+    # Rows without a date cannot be placed in a partition; duplicates per
+    # (astroid, date) keep the earliest row to satisfy the new unique constraint
+    # Stream on the statement only: Connection.execution_options() changes the
+    # shared migration connection itself, turning every later statement into a cursor
+    legacy_rows = conn.execute(sa.text(
+        'SELECT DISTINCT ON (astroid, date) id, date, astroid, astroname, year, month, week, today, tomorrow '
+        'FROM astro_fortunes_legacy WHERE date IS NOT NULL ORDER BY astroid, date, id'
+    ).execution_options(stream_results=True))
+    seen_hashes = set()
+    for batch in legacy_rows.mappings().partitions(COPY_BATCH_SIZE):
+        new_contents = []
+        new_fortunes = []
+        for row in batch:
+            fortune = {key: row[key] for key in ('id', 'date', 'astroid', 'astroname', 'today', 'tomorrow')}
+            for period in ('year', 'month', 'week'):
+                content = row[period] or {}
+                period_hash = _content_hash(content)
+                if period_hash not in seen_hashes:
+                    seen_hashes.add(period_hash)
+                    new_contents.append({'hash': period_hash, 'content': content})
+                fortune[f'{period}_hash'] = period_hash
+            new_fortunes.append(fortune)
+        if new_contents:
+            conn.execute(contents.insert(), new_contents)
+        conn.execute(fortunes.insert(), new_fortunes)
+
+    op.execute("SELECT setval(pg_get_serial_sequence('astro_fortunes', 'id'), coalesce(max(id), 0) + 1, false) FROM astro_fortunes")
+    op.drop_table('astro_fortunes_legacy')
+
+
+def downgrade() -> None:
+    op.rename_table('astro_fortunes', 'astro_fortunes_partitioned')
+    op.execute('ALTER TABLE astro_fortunes_partitioned RENAME CONSTRAINT astro_fortunes_pkey TO astro_fortunes_partitioned_pkey')
+    op.execute('ALTER TABLE astro_fortunes_partitioned RENAME CONSTRAINT uq_astro_fortunes_astroid_date TO uq_astro_fortunes_partitioned_astroid_date')
+    op.execute('ALTER SEQUENCE astro_fortunes_id_seq RENAME TO astro_fortunes_partitioned_id_seq')
+
+    op.create_table('astro_fortunes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('astroid', sa.Integer(), nullable=True),
+    sa.Column('astroname', sa.String(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.Column('year', sa.JSON(), nullable=True),
+    sa.Column('month', sa.JSON(), nullable=True),
+    sa.Column('week', sa.JSON(), nullable=True),
+    sa.Column('today', sa.JSON(), nullable=True),
+    sa.Column('tomorrow', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        'INSERT INTO astro_fortunes (id, astroid, astroname, date, year, month, week, today, tomorrow) '
+        'SELECT f.id, f.astroid, f.astroname, f.date, y.content::json, m.content::json, w.content::json, '
+        'f.today::json, f.tomorrow::json '
+        'FROM astro_fortunes_partitioned f '
+        'LEFT JOIN astro_fortune_contents y ON y.hash = f.year_hash '
+        'LEFT JOIN astro_fortune_contents m ON m.hash = f.month_hash '
+        'LEFT JOIN astro_fortune_contents w ON w.hash = f.week_hash'
+    )
+    op.execute("SELECT setval(pg_get_serial_sequence('astro_fortunes', 'id'), coalesce(max(id), 0) + 1, false) FROM astro_fortunes")
+    op.create_index(op.f('ix_astro_fortunes_astroid'), 'astro_fortunes', ['astroid'], unique=False)
+    op.create_index(op.f('ix_astro_fortunes_date'), 'astro_fortunes', ['date'], unique=False)
+    op.create_index(op.f('ix_astro_fortunes_id'), 'astro_fortunes', ['id'], unique=False)
+
+    # Dropping the parent drops all of its partitions
+    op.drop_table('astro_fortunes_partitioned')
+    op.drop_table('astro_fortune_contents')
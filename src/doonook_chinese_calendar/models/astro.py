@@ -1,18 +1,58 @@
-from sqlalchemy import Column, Integer, String, Date, JSON
+import hashlib
+import json
+from sqlalchemy import Column, ForeignKey, Integer, String, Date, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
 from ..core.database import Base
 
 
+def content_hash(content: dict) -> str:
+    """Content address of a fortune blob: sha256 of its canonical JSON"""
+    canonical = json.dumps(content or {}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AstroFortuneContent(Base):
+    """Deduplicated year/month/week fortune text shared across dates"""
+    __tablename__ = "astro_fortune_contents"
+
+    hash = Column(String(64), primary_key=True)
+    content = Column(JSONB, nullable=False, default=dict)
+
+
 class AstroFortune(Base):
     __tablename__ = "astro_fortunes"
+    __table_args__ = (
+        UniqueConstraint("astroid", "date", name="uq_astro_fortunes_astroid_date"),
+        # Monthly range partitions are created by the migration and `doonook-calendar prune-fortunes`
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    astroid = Column(Integer, index=True)
+    # The partition key has to be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(Date, primary_key=True)
+    astroid = Column(Integer)  # Covered by uq_astro_fortunes_astroid_date
     astroname = Column(String)
-    date = Column(Date, index=True)
     
-    # Store nested JSON data for period fortunes
-    year = Column(JSON,default=dict)      # 年运势
-    month = Column(JSON,default=dict)     # 月运势
-    week = Column(JSON,default=dict)      # 周运势
-    today = Column(JSON,default=dict)     # 今日运势
-    tomorrow = Column(JSON,default=dict)  # 明日运势
\ No newline at end of file
+    # Period fortunes repeat across dates, so they are stored once by hash
+    year_hash = Column(String(64), ForeignKey("astro_fortune_contents.hash"))    # 年运势
+    month_hash = Column(String(64), ForeignKey("astro_fortune_contents.hash"))   # 月运势
+    week_hash = Column(String(64), ForeignKey("astro_fortune_contents.hash"))    # 周运势
+    today = Column(JSONB, default=dict)     # 今日运势
+    tomorrow = Column(JSONB, default=dict)  # 明日运势
+
+    year_content = relationship(AstroFortuneContent, foreign_keys=[year_hash], lazy="joined")
+    month_content = relationship(AstroFortuneContent, foreign_keys=[month_hash], lazy="joined")
+    week_content = relationship(AstroFortuneContent, foreign_keys=[week_hash], lazy="joined")
+
+    @property
+    def year(self) -> dict:
+        return self.year_content.content if self.year_content else {}
+
+    @property
+    def month(self) -> dict:
+        return self.month_content.content if self.month_content else {}
+
+    @property
+    def week(self) -> dict:
+        return self.week_content.content if self.week_content else {}
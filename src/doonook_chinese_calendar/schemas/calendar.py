@@ -1,7 +1,19 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from datetime import datetime, date
 
+
+def parse_postgres_array(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        # Remove the curly braces and split by comma
+        cleaned = value.strip('{}')
+        if not cleaned:
+            return []
+        return [item.strip() for item in cleaned.split(',')]
+    return value
+
 class DoonookDailyCalendarInfo(BaseModel):
     date: str
     lunar_year: int
@@ -66,15 +78,7 @@ class DailyCalendarInfoSchema(DoonookDailyCalendarInfo,JiSuDailyCalendarInfo):
     @field_validator('yi', 'ji', 'suici', mode='before')
     @classmethod
     def parse_postgres_array(cls, value):
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            # Remove the curly braces and split by comma
-            cleaned = value.strip('{}')
-            if not cleaned:
-                return []
-            return [item.strip() for item in cleaned.split(',')]
-        return value
+        return parse_postgres_array(value)
 
     @field_validator('date', mode='before')
     @classmethod
@@ -85,3 +89,42 @@ class DailyCalendarInfoSchema(DoonookDailyCalendarInfo,JiSuDailyCalendarInfo):
 
     class Config:
         from_attributes = True
+
+
+class MonthCalendarDaySchema(BaseModel):
+    date: str
+    day: Optional[int] = None
+    in_month: Optional[bool] = None  # False for leading/trailing days of adjacent months
+    lunar_year: Optional[int] = None
+    lunar_month: Optional[str] = None
+    lunar_day: Optional[str] = None
+    is_leap_month: Optional[bool] = None
+    lunar_date: Optional[str] = None
+    solar_term: Optional[str] = None
+    year_ganzhi: Optional[str] = None
+    month_ganzhi: Optional[str] = None
+    day_ganzhi: Optional[str] = None
+    is_holiday: Optional[bool] = None
+    holiday_name: Optional[str] = None
+    yi: Optional[List[str]] = None  # 宜 (summary)
+    ji: Optional[List[str]] = None  # 忌 (summary)
+
+
+class MonthCalendarSchema(BaseModel):
+    year: int
+    month: int
+    days: List[MonthCalendarDaySchema]
+
+
+class FourPillarsRequest(BaseModel):
+    datetimes: List[datetime] = Field(..., max_length=100000)
+
+
+class FourPillarsSchema(BaseModel):
+    datetime: str
+    year_pillar: str
+    month_pillar: str
+    day_pillar: str
+    hour_pillar: str
+    bazi: str  # 八字, e.g. "甲辰 丁卯 壬午 庚子"
+    shengxiao: str  # 生肖 of the 立春-based year
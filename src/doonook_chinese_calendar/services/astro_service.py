@@ -1,11 +1,15 @@
 import logging
 import httpx
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from ..models.astro import AstroFortune
+from ..models.astro import AstroFortune, AstroFortuneContent, content_hash
 from datetime import date
 from typing import Any, List, Optional
 from ..core.config import settings
+from ..core.database import switch_to_primary
+from ..core.rate_limit import Priority, QuotaExceededError, get_limiter
+from ..core.locales import STORAGE_LANGUAGE, get_locale
 from ..schemas.astro import AstroFortuneSchema, JiSuFortuneSchema
 import traceback
 
@@ -20,40 +24,33 @@ class AstroService:
         self.juhe_api_key = settings.JUHE_API_KEY
     
     def _setup_mappings(self) -> None:
-        self.astro = {
-            1: "白羊座",
-            2: "金牛座",
-            3: "双子座",
-            4: "巨蟹座",
-            5: "狮子座",
-            6: "处女座",
-            7: "天秤座",
-            8: "天蝎座",
-            9: "射手座",
-            10: "摩羯座",
-            11: "水瓶座",
-            12: "双鱼座"
-        }
+        # Juhe looks signs up by their zh_CN name, so this stays in the storage locale
+        self.astro = get_locale(STORAGE_LANGUAGE).astro
         
     
-    async def get_daily_fortune(self, astroid: int, date_param: date, db: Session) -> AstroFortuneSchema:
+    async def get_daily_fortune(self, astroid: int, date_param: date, db: Session, priority: Priority = Priority.USER, lang: Optional[str] = None) -> AstroFortuneSchema:
         """Get daily fortune for an astrology sign"""
         try:  
+            locale = get_locale(lang)
             # Check if we have fortune in database
             today = date_param
-            select_query = select(AstroFortune).where(
+            # Lambda statement: cached by code location, astroid/today become bound parameters
+            select_query = lambda_stmt(lambda: select(AstroFortune).where(
                 AstroFortune.astroid == astroid,
                 AstroFortune.date == today
-            )
+            ))
             db_fortune = db.execute(select_query).scalar()
+            if db_fortune is None and switch_to_primary(db):
+                # Replication lag: retry the miss on the primary before calling the API
+                db_fortune = db.execute(select_query).scalar()
             
             if db_fortune:
                 logger.debug(f"Found fortune in database for astroid {astroid} on {today}")
-                return AstroFortuneSchema.model_validate(db_fortune)
+                return self._localize_fortune(AstroFortuneSchema.model_validate(db_fortune), locale)
             
             # Fetch from API if not in database
             logger.debug(f"Fetching fortune from API for astroid {astroid}")
-            api_data: JiSuFortuneSchema = await self._fetch_api_data(astroid, today)
+            api_data: JiSuFortuneSchema = await self._fetch_api_data(astroid, today, priority)
             logger.debug(f"API data: {api_data}")
             
             if api_data:
@@ -68,36 +65,64 @@ class AstroService:
                 try:
                     # Create schema from validated data
                     fortune_schema = AstroFortuneSchema.model_validate(api_data)
-                    return fortune_schema
+                    return self._localize_fortune(fortune_schema, locale)
                 except Exception as validation_error:
                     # Log detailed validation error
                     logging.error(f"Schema validation error: {str(validation_error)}")
                     raise ValueError(f"Schema validation error: {str(validation_error)}")
             
             return None
+        except QuotaExceededError:
+            # Not a bad request; let the endpoint report it as such
+            raise
         except Exception as e:
             error_msg = f"Error getting fortune for astroid {astroid}"
             logging.error(traceback.format_exc())
             raise ValueError(error_msg) from e
 
+    def _localize_fortune(self, fortune: AstroFortuneSchema, locale) -> AstroFortuneSchema:
+        # Only the sign name is ours to translate; fortune text comes from upstream as-is
+        if locale.language == STORAGE_LANGUAGE:
+            return fortune
+        fortune.astroname = locale.astro.get(fortune.astroid, fortune.astroname)
+        return fortune
+
     async def create_fortune(self, astroid: int, fortune_data: dict, db: Session) -> AstroFortune:
         """Create a new fortune for an astrology sign"""
         try:
-            fortune = AstroFortune(
-                **fortune_data
+            fortune_data = dict(fortune_data)
+            # Year/month/week text is shared by many dates, store each blob once
+            for period in ("year", "month", "week"):
+                content = fortune_data.pop(period, None) or {}
+                period_hash = content_hash(content)
+                db.execute(
+                    insert(AstroFortuneContent)
+                    .values(hash=period_hash, content=content)
+                    .on_conflict_do_nothing(index_elements=["hash"])
+                )
+                fortune_data[f"{period}_hash"] = period_hash
+            # A concurrent first request may have stored this sign and date already;
+            # keep whichever row won and return it
+            db.execute(
+                insert(AstroFortune)
+                .values(**fortune_data)
+                .on_conflict_do_nothing(index_elements=["astroid", "date"])
             )
-            db.add(fortune)
+            fortune = db.execute(select(AstroFortune).where(
+                AstroFortune.astroid == astroid,
+                AstroFortune.date == fortune_data["date"]
+            )).scalar_one()
             db.commit()
-            db.refresh(fortune)
             return fortune
         except Exception as e:
             error_msg = f"Error saving astrology data for astroid {astroid} to database"
             db.rollback()  # Roll back the transaction on error
             raise ValueError(error_msg) from e
     
-    async def _fetch_api_data(self, astroid: int, date: date) -> JiSuFortuneSchema:
+    async def _fetch_api_data(self, astroid: int, date: date, priority: Priority = Priority.USER) -> JiSuFortuneSchema:
         """Fetch fortune data from API"""
         try:
+            await get_limiter("jisu").acquire(priority)
             async with httpx.AsyncClient() as client:
                 params = {
                     "appkey": self.api_key, 
@@ -113,20 +138,20 @@ class AstroService:
                 result = data["result"]
                 jisu_fortune = JiSuFortuneSchema.model_validate(result)
                 if jisu_fortune.check_year_fortune_empty():
-                    year_data = await self.get_fortune_by_type(astroid, "year")
+                    year_data = await self.get_fortune_by_type(astroid, "year", priority)
                     jisu_fortune.year.career = "".join(year_data.get("career", []))
                     jisu_fortune.year.money = "".join(year_data.get("finance", []))
                     jisu_fortune.year.love = "".join(year_data.get("love", []))
                     jisu_fortune.year.health = "".join(year_data.get("health", []))
                 if jisu_fortune.check_month_fortune_empty():
-                    month_data = await self.get_fortune_by_type(astroid, "month")
+                    month_data = await self.get_fortune_by_type(astroid, "month", priority)
                     jisu_fortune.month.summary = month_data.get("all", "")
                     jisu_fortune.month.health = month_data.get("health", "")
                     jisu_fortune.month.love = month_data.get("love", "")
                     jisu_fortune.month.money = month_data.get("money", "")
                     jisu_fortune.month.career = month_data.get("work", "")
                 if jisu_fortune.check_week_fortune_empty():
-                    week_data = await self.get_fortune_by_type(astroid, "week")
+                    week_data = await self.get_fortune_by_type(astroid, "week", priority)
                     jisu_fortune.week.health = week_data.get("health", "")
                     jisu_fortune.week.career = week_data.get("work", "")
                     jisu_fortune.week.love = week_data.get("love", "")
@@ -136,14 +161,17 @@ class AstroService:
                 jisu_fortune.astroname = self.astro.get(astroid, "Unknown")
                 
                 return jisu_fortune
+        except QuotaExceededError:
+            raise
         except Exception as e:
             error_msg = f"Error fetching astrology data for astroid {astroid} on date {date}"
             logging.error(error_msg)
             raise ValueError(error_msg) from e
 
 
-    async def get_fortune_by_type(self, astroid: int, period: str):
+    async def get_fortune_by_type(self, astroid: int, period: str, priority: Priority = Priority.USER):
         logger.debug(f"Getting fortune by type {period} for astroid {astroid}")
+        await get_limiter("juhe").acquire(priority)
         async with httpx.AsyncClient() as client:
             apiUrl = 'http://web.juhe.cn/constellation/getAll'
             requestParams = {
@@ -1,68 +1,139 @@
-from datetime import datetime
-from sqlalchemy import select
+from datetime import date as date_type, datetime, timedelta, timezone
+from sqlalchemy import bindparam, lambda_stmt, select
 import sxtwl
 import httpx
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from chinese_calendar.utils import get_holidays,get_holiday_detail
-from ..schemas.calendar import DoonookDailyCalendarInfo, JiSuDailyCalendarInfo,DailyCalendarInfoSchema
+from ..schemas.calendar import DoonookDailyCalendarInfo, JiSuDailyCalendarInfo,DailyCalendarInfoSchema, MonthCalendarDaySchema, MonthCalendarSchema, parse_postgres_array
 from ..core.config import settings
 from ..models.calendar import DailyCalendar
+from ..core.database import switch_to_primary
+from ..core.rate_limit import Priority, QuotaExceededError, get_limiter
+from ..core.locales import CalendarLocale, STORAGE_LANGUAGE, get_locale
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+import asyncio
+import hashlib
 import logging
+import multiprocessing
 import traceback
 
+# A month grid is always 6 weeks of 7 days, starting on Monday
+MONTH_GRID_DAYS = 42
+# Number of 宜/忌 items kept per cell in the month grid summary
+YI_JI_SUMMARY_SIZE = 4
+# Rows fetched per round trip when streaming a date range
+STREAM_BATCH_SIZE = 500
+# Rendered ICS feeds kept in memory, keyed by range and options
+ICS_CACHE_SIZE = 64
+# 八字 batches larger than this are split into chunks across a process pool
+BAZI_CHUNK_SIZE = 5000
+# sxtwl reports 节气 moments in Beijing time
+JIEQI_TIMEZONE = timezone(timedelta(hours=8))
+
+_bazi_pool: Optional[ProcessPoolExecutor] = None
+_bazi_worker_service: Optional["ChineseCalendarService"] = None
+
+
+@lru_cache(maxsize=128)
+def _projected_calendar_query(fields: frozenset):
+    # Built once per projection; executed with a "date" parameter
+    return (
+        select(DailyCalendar)
+        .where(DailyCalendar.date == bindparam("date"))
+        .options(load_only(*(getattr(DailyCalendar, field) for field in sorted(fields))))
+    )
+
+
+def _get_bazi_pool() -> ProcessPoolExecutor:
+    global _bazi_pool
+    if _bazi_pool is None:
+        # Spawned, not forked: a fork would copy the server's event loop, sockets and DB pool
+        _bazi_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _bazi_pool
+
+
+def shutdown_bazi_pool() -> None:
+    """Stop the 八字 worker processes, if any were started"""
+    global _bazi_pool
+    if _bazi_pool is not None:
+        _bazi_pool.shutdown(cancel_futures=True)
+        _bazi_pool = None
+
+
+def _four_pillars_chunk(datetimes: List[datetime], lang: Optional[str] = None) -> List[Dict[str, str]]:
+    # Runs in a pool worker, which keeps its own service and ganzhi tables
+    global _bazi_worker_service
+    if _bazi_worker_service is None:
+        _bazi_worker_service = ChineseCalendarService()
+    return _bazi_worker_service.get_four_pillars(datetimes, lang)
+
 class ChineseCalendarService:
     def __init__(self):
         self._setup_mappings()
         self.api_url = "https://api.jisuapi.com/huangli/date"
         self.api_key = settings.JISU_API_KEY
+        # Feeds only depend on their arguments, so each one is rendered once per process
+        self._build_ics_feed = lru_cache(maxsize=ICS_CACHE_SIZE)(self._build_ics_feed)
 
     def _setup_mappings(self):
-        self.Gan = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
-        self.Zhi = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
-        self.ShX = ["鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪"]
-        self.jqmc = ["冬至", "小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨", "立夏",
-                     "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑", "白露", "秋分", "寒露",
-                     "霜降", "立冬", "小雪", "大雪"]
-        self.ymc = ["正", "二", "三", "四", "五", "六", "七", "八", "九", "十","十一", "十二"]
-        self.rmc = ["初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十",
-                    "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十",
-                    "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十"]
-        self.festival_mapping = {
-            "New Year's Day": "元旦",
-            "Spring Festival": "春节",
-            "Tomb-sweeping Day": "清明节",
-            "Labour Day": "劳动节",
-            "Dragon Boat Festival": "端午节",
-            "National Day": "国庆节",
-            "Mid-autumn Festival": "中秋节",
-        }
+        # Stored rows always use the storage locale; other languages are applied on output
+        self.storage_locale = get_locale(STORAGE_LANGUAGE)
+        self.Gan = self.storage_locale.gan
+        self.Zhi = self.storage_locale.zhi
+        self.ShX = self.storage_locale.shengxiao
+        self.ganzhi = self.storage_locale.ganzhi
+        self.jqmc = self.storage_locale.solar_terms
+        self.ymc = self.storage_locale.months
+        self.rmc = self.storage_locale.days
+        self.festival_mapping = self.storage_locale.festivals
 
-    async def get_daily_calendar(self, date: datetime, db: Session) -> DailyCalendarInfoSchema:
+    async def get_daily_calendar(self, date: datetime, db: Session, fields: Optional[Set[str]] = None, priority: Priority = Priority.USER, lang: Optional[str] = None) -> Union[DailyCalendarInfoSchema, dict]:
+        """Get the daily calendar; with `fields`, only those columns are loaded and returned as a dict"""
         try:
+            locale = get_locale(lang)
             # Check database first
-            select_query = select(DailyCalendar).where(DailyCalendar.date == date.date())
-            db_calendar = db.execute(select_query).scalar_one_or_none()
+            # Statements are cached so SQLAlchemy skips rebuilding and recompiling them per request
+            query_date = date.date()
+            if fields:
+                select_query = _projected_calendar_query(frozenset(fields))
+                params = {"date": query_date}
+            else:
+                select_query = lambda_stmt(lambda: select(DailyCalendar).where(DailyCalendar.date == query_date))
+                params = {}
+            db_calendar = db.execute(select_query, params).scalar_one_or_none()
+            if db_calendar is None and switch_to_primary(db):
+                # A replica may not have the row another worker just saved yet
+                db_calendar = db.execute(select_query, params).scalar_one_or_none()
             if db_calendar:
-                return self._format_calendar_response(db_calendar)
+                return self._localize_calendar_info(self._format_calendar_response(db_calendar, fields), date, locale)
 
             # Calculate basic calendar info
             base_info = self._calculate_calendar_info(date)
             
             # Fetch additional info from API
-            api_info = await self._fetch_api_data(date)
+            api_info = await self._fetch_api_data(date, priority)
             
             # Combine and save to database
             combined_info = DailyCalendarInfoSchema(**base_info.model_dump(),**api_info.model_dump())
             self._save_to_database(db,combined_info)
             
-            return combined_info
+            if fields:
+                return self._localize_calendar_info(combined_info.model_dump(include=fields), date, locale)
+            return self._localize_calendar_info(combined_info, date, locale)
             
+        except QuotaExceededError:
+            # Not a bad request; let the endpoint report it as such
+            raise
         except Exception as e:
             error_msg = f"Error getting daily calendar for date: {date}"
             logging.error(traceback.format_exc())
             raise ValueError(error_msg) from e
 
-    async def _fetch_api_data(self, date: datetime) -> JiSuDailyCalendarInfo:
+    async def _fetch_api_data(self, date: datetime, priority: Priority = Priority.USER) -> JiSuDailyCalendarInfo:
+        await get_limiter("jisu").acquire(priority)
         async with httpx.AsyncClient() as client:
             # https://api.jisuapi.com/huangli/date?appkey=yourappkey&year=2015&month=10&day=27
             params = {
@@ -85,42 +156,55 @@ class ChineseCalendarService:
         db.add(calendar_entry)
         db.commit()
 
-    def _calculate_calendar_info(self, date: datetime) -> DoonookDailyCalendarInfo:
+    def _calculate_calendar_info(self, date: datetime, locale: Optional[CalendarLocale] = None) -> DoonookDailyCalendarInfo:
         try:
             day = sxtwl.fromSolar(date.year, date.month, date.day)
-            
-            # Get lunar date components
-            lunar_month = day.getLunarMonth()
-            lunar_day = day.getLunarDay()
-            lunar_year = day.getLunarYear()
-            is_leap_month = day.isLunarLeap()
-            
-            # Get solar terms
-            jq = day.getJieQi()
-            solar_term = self.jqmc[jq] if jq <= 24 and jq >= 0 else None
-            
-            # Get heavenly stems and earthly branches for year, month, day
-            year_gz = day.getYearGZ()
-            month_gz = day.getMonthGZ()
-            day_gz = day.getDayGZ()
-            result = {
-                "date": date.strftime("%Y-%m-%d"),
-                "lunar_year": lunar_year,
-                "lunar_month": self.ymc[lunar_month - 1],
-                "lunar_day": self.rmc[lunar_day - 1],
-                "is_leap_month": is_leap_month,
-                "lunar_date": f"{'闰' if is_leap_month else ''}{self.ymc[lunar_month - 1]}月{self.rmc[lunar_day - 1]}",
-                "solar_term": solar_term,
-                "year_ganzhi": f"{self.Gan[year_gz.tg]}{self.Zhi[year_gz.dz]}",
-                "month_ganzhi": f"{self.Gan[month_gz.tg]}{self.Zhi[month_gz.dz]}",
-                "day_ganzhi": f"{self.Gan[day_gz.tg]}{self.Zhi[day_gz.dz]}",
-            }
-            return DoonookDailyCalendarInfo(**result)
-            
+            return self._build_calendar_info(day, date, locale)
         except Exception as e:
             error_msg = f"Error converting date to lunar calendar: {date}"
             raise ValueError(error_msg) from e
 
+    def _calculate_calendar_range(self, start_date: date_type, days: int, locale: Optional[CalendarLocale] = None) -> Iterator[Tuple[date_type, DoonookDailyCalendarInfo]]:
+        """Compute lunar info for consecutive days, stepping sxtwl instead of re-resolving each date"""
+        try:
+            day = sxtwl.fromSolar(start_date.year, start_date.month, start_date.day)
+            for offset in range(days):
+                current = start_date + timedelta(days=offset)
+                yield current, self._build_calendar_info(day, current, locale)
+                day = day.after(1)
+        except Exception as e:
+            error_msg = f"Error converting date range to lunar calendar: {start_date} (+{days} days)"
+            raise ValueError(error_msg) from e
+
+    def _build_calendar_info(self, day: "sxtwl.Day", date: date_type, locale: Optional[CalendarLocale] = None) -> DoonookDailyCalendarInfo:
+        locale = locale or self.storage_locale
+        # Get lunar date components
+        lunar_month = day.getLunarMonth()
+        lunar_day = day.getLunarDay()
+        lunar_year = day.getLunarYear()
+        is_leap_month = day.isLunarLeap()
+        
+        # Get solar terms
+        jq = day.getJieQi()
+        solar_term = locale.solar_terms[jq] if jq <= 24 and jq >= 0 else None
+        
+        # Get heavenly stems and earthly branches for year, month, day
+        year_gz = day.getYearGZ()
+        month_gz = day.getMonthGZ()
+        day_gz = day.getDayGZ()
+        result = {
+            "date": date.strftime("%Y-%m-%d"),
+            "lunar_year": lunar_year,
+            "lunar_month": locale.months[lunar_month - 1],
+            "lunar_day": locale.days[lunar_day - 1],
+            "is_leap_month": is_leap_month,
+            "lunar_date": locale.lunar_dates[int(is_leap_month)][lunar_month - 1][lunar_day - 1],
+            "solar_term": solar_term,
+            "year_ganzhi": locale.ganzhi[year_gz.tg][year_gz.dz],
+            "month_ganzhi": locale.ganzhi[month_gz.tg][month_gz.dz],
+            "day_ganzhi": locale.ganzhi[day_gz.tg][day_gz.dz],
+        }
+        return DoonookDailyCalendarInfo(**result)
 
     def _get_suitable_activities(self, heavenly_stem: int, earthly_branch: int) -> list:
         # This would contain your logic for determining suitable activities
@@ -131,28 +215,275 @@ class ChineseCalendarService:
         # This would contain your logic for determining unsuitable activities
         return ["动土", "安葬"]  # Example activities
 
-    def _format_calendar_response(self, db_calendar: DailyCalendarInfoSchema) -> dict:
-        # Implement the logic to format the database response into the desired format
-        # This is a placeholder and should be replaced with the actual implementation
-        return DailyCalendarInfoSchema.model_validate(db_calendar)
+    def _format_calendar_response(self, db_calendar: DailyCalendar, fields: Optional[Set[str]] = None) -> Union[DailyCalendarInfoSchema, dict]:
+        if not fields:
+            return DailyCalendarInfoSchema.model_validate(db_calendar)
+
+        # Partial rows can't be validated against the full schema, so apply
+        # the same conversions as its validators to just the loaded columns
+        response = {}
+        for field in fields:
+            value = getattr(db_calendar, field)
+            if field in ("yi", "ji", "suici"):
+                value = parse_postgres_array(value)
+            elif field == "date" and isinstance(value, date_type):
+                value = value.strftime("%Y-%m-%d")
+            elif field == "lunar_year" and value is not None:
+                value = int(value)
+            response[field] = value
+        return response
+
+    def _localize_calendar_info(self, result: Union[DailyCalendarInfoSchema, dict], date: datetime, locale: CalendarLocale) -> Union[DailyCalendarInfoSchema, dict]:
+        """Swap the computed lunar fields of a stored-locale result for `locale`'s labels"""
+        if locale is self.storage_locale:
+            return result
+        info = self._calculate_calendar_info(date, locale).model_dump()
+        if isinstance(result, dict):
+            result.update({key: info[key] for key in result if key in info})
+            return result
+        return result.model_copy(update=info)
+
+    async def get_month_calendar(self, year: int, month: int, db: Session, fields: Optional[Set[str]] = None, lang: Optional[str] = None) -> MonthCalendarSchema:
+        """Build a 6x7 month grid from local sxtwl computation, one ranged query and holiday data"""
+        try:
+            locale = get_locale(lang)
+            first_day = date_type(year, month, 1)
+            grid_start = first_day - timedelta(days=first_day.weekday())
+            grid_end = grid_start + timedelta(days=MONTH_GRID_DAYS - 1)
+            if fields is None:
+                fields = set(MonthCalendarDaySchema.model_fields)
+
+            # 宜/忌 only come from stored JiSu data; dates that were never fetched get empty lists
+            yi_ji = {}
+            if fields & {"yi", "ji"}:
+                select_query = select(DailyCalendar.date, DailyCalendar.yi, DailyCalendar.ji).where(
+                    DailyCalendar.date.between(grid_start, grid_end)
+                )
+                yi_ji = {
+                    row.date: (
+                        parse_postgres_array(row.yi or [])[:YI_JI_SUMMARY_SIZE],
+                        parse_postgres_array(row.ji or [])[:YI_JI_SUMMARY_SIZE],
+                    )
+                    for row in db.execute(select_query)
+                }
+
+            holidays = {}
+            # Years chinese_calendar has no data for leave the holiday fields null
+            holiday_years = set()
+            if fields & {"is_holiday", "holiday_name"}:
+                holidays, holiday_years = self._get_holidays_by_year(grid_start, grid_end, locale)
 
-    def convert_to_lunar(self, date: datetime) -> dict:
-        return self._calculate_calendar_info(date)
+            days = []
+            for current, info in self._calculate_calendar_range(grid_start, MONTH_GRID_DAYS, locale):
+                yi, ji = yi_ji.get(current, ([], []))
+                cell = {
+                    **info.model_dump(),
+                    "day": current.day,
+                    "in_month": current.month == month,
+                    "is_holiday": current in holidays if current.year in holiday_years else None,
+                    "holiday_name": holidays.get(current) or None,
+                    "yi": yi,
+                    "ji": ji,
+                }
+                days.append(MonthCalendarDaySchema(**{key: cell[key] for key in fields | {"date"}}))
+
+            return MonthCalendarSchema(year=year, month=month, days=days)
+        except Exception as e:
+            error_msg = f"Error getting month calendar for {year}-{month:02d}"
+            logging.error(traceback.format_exc())
+            raise ValueError(error_msg) from e
+
+    def iter_calendar_range(self, start_date: date_type, end_date: date_type, db: Session, lang: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one calendar dict per day in [start_date, end_date] with constant memory
+
+        Stored rows are read through a server-side cursor and merged in date order
+        with local sxtwl computation; dates never fetched from JiSu only carry the
+        lunar fields.
+        """
+        select_query = (
+            select(DailyCalendar)
+            .where(DailyCalendar.date.between(start_date, end_date))
+            .order_by(DailyCalendar.date)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        locale = get_locale(lang)
+        rows = iter(db.scalars(select_query))
+        row = next(rows, None)
+        days = (end_date - start_date).days + 1
+        for current, info in self._calculate_calendar_range(start_date, days, locale):
+            while row is not None and row.date < current:
+                row = next(rows, None)
+            if row is not None and row.date == current:
+                item = self._format_calendar_response(row).model_dump()
+                if locale is not self.storage_locale:
+                    item.update(info.model_dump())
+                yield item
+                # Keep the identity map from growing with the range
+                db.expunge(row)
+            else:
+                yield info.model_dump()
+
+    def get_four_pillars(self, datetimes: List[datetime], lang: Optional[str] = None) -> List[Dict[str, str]]:
+        """Compute 八字 for each datetime; naive values are taken as local (settings.TIMEZONE) time
+
+        The year pillar changes at the moment of 立春 and the month pillar at the
+        moment of each 节. Hours follow the 早晚子时 convention: 23:00-24:00 keeps
+        the current day pillar while its hour stem is that of the next day's 子时,
+        e.g. 23:30 on a 戊戌 day is a 甲子 hour.
+        """
+        locale = get_locale(lang)
+        local_tz = ZoneInfo(settings.TIMEZONE)
+        days = {}
+        results = []
+        for value in datetimes:
+            moment = value.astimezone(local_tz) if value.tzinfo else value.replace(tzinfo=local_tz)
+            local = moment.replace(tzinfo=None)
+            cached = days.get(local.date())
+            if cached is None:
+                day = sxtwl.fromSolar(local.year, local.month, local.day)
+                cached = days[local.date()] = (day, self._jie_moment(day))
+            day, jie_moment = cached
+            # sxtwl switches year and month on the 节 day as a whole; until the
+            # exact moment the previous day's pillars still apply
+            pillar_day = day.before(1) if jie_moment is not None and moment < jie_moment else day
+            year_gz = pillar_day.getYearGZ()
+            month_gz = pillar_day.getMonthGZ()
+            day_gz = day.getDayGZ()
+            hour_gz = day.getHourGZ(local.hour)
+            pillars = (
+                locale.ganzhi[year_gz.tg][year_gz.dz],
+                locale.ganzhi[month_gz.tg][month_gz.dz],
+                locale.ganzhi[day_gz.tg][day_gz.dz],
+                locale.ganzhi[hour_gz.tg][hour_gz.dz],
+            )
+            results.append({
+                "datetime": local.isoformat(),
+                "year_pillar": pillars[0],
+                "month_pillar": pillars[1],
+                "day_pillar": pillars[2],
+                "hour_pillar": pillars[3],
+                "bazi": " ".join(pillars),
+                "shengxiao": locale.shengxiao[year_gz.dz],
+            })
+        return results
+
+    def _jie_moment(self, day: "sxtwl.Day") -> Optional[datetime]:
+        # Odd 节气 indices are the 节 (立春 is 3); 中气 don't move any pillar
+        if not day.hasJieQi() or day.getJieQi() % 2 == 0:
+            return None
+        dd = sxtwl.JD2DD(day.getJieQiJD())
+        return datetime(int(dd.Y), int(dd.M), int(dd.D), tzinfo=JIEQI_TIMEZONE) + timedelta(
+            hours=int(dd.h), minutes=int(dd.m), seconds=round(dd.s)
+        )
+
+    async def get_four_pillars_batch(self, datetimes: List[datetime], lang: Optional[str] = None) -> List[Dict[str, str]]:
+        """Compute 八字 in order, fanning large batches out to a process pool"""
+        try:
+            if len(datetimes) <= BAZI_CHUNK_SIZE:
+                return self.get_four_pillars(datetimes, lang)
+
+            loop = asyncio.get_running_loop()
+            pool = _get_bazi_pool()
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(pool, _four_pillars_chunk, datetimes[start:start + BAZI_CHUNK_SIZE], lang)
+                for start in range(0, len(datetimes), BAZI_CHUNK_SIZE)
+            ))
+            return [result for chunk in chunks for result in chunk]
+        except Exception as e:
+            error_msg = f"Error computing four pillars for {len(datetimes)} datetimes"
+            logging.error(traceback.format_exc())
+            raise ValueError(error_msg) from e
+
+    def get_ics_feed(self, start_date: date_type, end_date: date_type, lunar: bool = True, solar_terms: bool = True, holidays: bool = True, lang: Optional[str] = None) -> Tuple[bytes, str]:
+        """Return an iCalendar feed for [start_date, end_date] and its ETag"""
+        # Resolve the default language first so it is part of the cache key
+        return self._build_ics_feed(start_date, end_date, lunar, solar_terms, holidays, get_locale(lang).language)
+
+    def _build_ics_feed(self, start_date: date_type, end_date: date_type, lunar: bool, solar_terms: bool, holidays: bool, language: str) -> Tuple[bytes, str]:
+        locale = get_locale(language)
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Doonook//Chinese Calendar//CN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{locale.calendar_name}",
+            f"X-WR-TIMEZONE:{settings.TIMEZONE}",
+        ]
+
+        holiday_names = {}
+        if holidays:
+            holiday_names, _ = self._get_holidays_by_year(start_date, end_date, locale)
+
+        days = (end_date - start_date).days + 1
+        for current, info in self._calculate_calendar_range(start_date, days, locale):
+            if lunar:
+                lines.extend(self._ics_event(current, "lunar", info.lunar_date))
+            if solar_terms and info.solar_term:
+                lines.extend(self._ics_event(current, "jieqi", info.solar_term))
+            if holiday_names.get(current):
+                lines.extend(self._ics_event(current, "holiday", holiday_names[current]))
+        lines.append("END:VCALENDAR")
+
+        content = ("\r\n".join(lines) + "\r\n").encode("utf-8")
+        etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        return content, etag
+
+    def _ics_event(self, day: date_type, kind: str, summary: str) -> List[str]:
+        # UID and DTSTAMP are derived from the date so feeds render byte-for-byte the same
+        stamp = day.strftime("%Y%m%d")
+        return [
+            "BEGIN:VEVENT",
+            f"UID:{stamp}-{kind}@doonook-chinese-calendar",
+            f"DTSTAMP:{stamp}T000000Z",
+            f"DTSTART;VALUE=DATE:{stamp}",
+            f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{summary}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]
+
+    def convert_to_lunar(self, date: datetime, lang: Optional[str] = None) -> dict:
+        return self._calculate_calendar_info(date, get_locale(lang))
     
-    def get_holidays(self, start_date: datetime, end_date: datetime) -> list:
-        return self._get_holidays(start_date, end_date)
+    def get_holidays(self, start_date: datetime, end_date: datetime, lang: Optional[str] = None) -> list:
+        return self._get_holidays(start_date, end_date, get_locale(lang))
     
-    def _get_holidays(self, start_date: datetime, end_date: datetime) -> list:
+    def _get_holidays(self, start_date: datetime, end_date: datetime, locale: Optional[CalendarLocale] = None) -> list:
         holidays = get_holidays(start_date, end_date, True)
         holiday_details = [(holiday,get_holiday_detail(holiday)[1]) for holiday in holidays]
         holiday_list = [
             {
                 "date": holiday[0],
-                "name": self._get_holiday_name(holiday[1]),
+                "name": self._get_holiday_name(holiday[1], locale),
             }
             for holiday in holiday_details
         ]
         return holiday_list
     
-    def _get_holiday_name(self, holiday: str) -> str:
-        return self.festival_mapping.get(holiday, '')
+    def _get_holidays_by_year(self, start_date: date_type, end_date: date_type, locale: Optional[CalendarLocale] = None) -> Tuple[Dict[date_type, str], Set[int]]:
+        """Holiday names in [start_date, end_date] and the years that had holiday data
+
+        chinese_calendar only knows the years the State Council has published, so
+        each year is looked up on its own and a missing one doesn't hide the rest.
+        """
+        holidays = {}
+        years = set()
+        for year in range(start_date.year, end_date.year + 1):
+            try:
+                holidays.update(
+                    (holiday["date"], holiday["name"])
+                    for holiday in self._get_holidays(
+                        max(start_date, date_type(year, 1, 1)),
+                        min(end_date, date_type(year, 12, 31)),
+                        locale,
+                    )
+                )
+                years.add(year)
+            except NotImplementedError:
+                logging.warning(f"No holiday data for {year}")
+        return holidays, years
+
+    def _get_holiday_name(self, holiday: str, locale: Optional[CalendarLocale] = None) -> str:
+        festivals = locale.festivals if locale else self.festival_mapping
+        return festivals.get(holiday, '')
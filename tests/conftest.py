@@ -0,0 +1,5 @@
+import os
+
+# CalendarSettings requires these; tests never reach the real services or database
+for name in ("JISU_API_KEY", "JUHE_API_KEY", "POSTGRES_USER", "POSTGRES_PASSWORD"):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,71 @@
+from datetime import date, datetime, timedelta
+import asyncio
+
+import pytest
+
+from doonook_chinese_calendar.services import calendar_service
+from doonook_chinese_calendar.services.calendar_service import BAZI_CHUNK_SIZE, ChineseCalendarService
+
+
+@pytest.fixture
+def service():
+    return ChineseCalendarService()
+
+
+@pytest.fixture
+def no_holiday_data_for_2025(monkeypatch):
+    original = calendar_service.get_holidays
+
+    def get_holidays(start, end, include_weekends=True):
+        if 2025 in (start.year, end.year):
+            raise NotImplementedError("no data for 2025")
+        return original(start, end, include_weekends)
+
+    monkeypatch.setattr(calendar_service, "get_holidays", get_holidays)
+
+
+def test_ics_feed_keeps_holidays_of_years_with_data(service, no_holiday_data_for_2025):
+    content, _ = service.get_ics_feed(date(2024, 9, 1), date(2025, 8, 31), lunar=False, solar_terms=False, lang="zh_CN")
+    feed = content.decode("utf-8")
+    assert "UID:20241001-holiday@doonook-chinese-calendar" in feed
+    assert "SUMMARY:国庆节" in feed
+    assert "UID:20250101-holiday" not in feed
+
+
+def test_holidays_by_year_reports_covered_years(service, no_holiday_data_for_2025):
+    holidays, years = service._get_holidays_by_year(date(2024, 12, 25), date(2025, 1, 5))
+    assert years == {2024}
+    assert all(day.year == 2024 for day in holidays)
+
+
+def _bazi(service, value: str) -> str:
+    return service.get_four_pillars([datetime.fromisoformat(value)], "zh_CN")[0]["bazi"]
+
+
+@pytest.mark.parametrize("value, bazi", [
+    # 立春 2024 falls at 16:26:53 Beijing time
+    ("2024-02-04T16:26", "癸卯 乙丑 戊戌 庚申"),
+    ("2024-02-04T16:27", "甲辰 丙寅 戊戌 庚申"),
+    ("2024-02-04T08:26:00+00:00", "癸卯 乙丑 戊戌 庚申"),
+    # 惊蛰 2024 falls at 10:22:31
+    ("2024-03-05T10:22", "甲辰 丙寅 戊辰 丁巳"),
+    ("2024-03-05T10:23", "甲辰 丁卯 戊辰 丁巳"),
+])
+def test_four_pillars_switch_at_jie_moment(service, value, bazi):
+    assert _bazi(service, value) == bazi
+
+
+def test_four_pillars_late_zi_hour_keeps_day_and_takes_next_stem(service):
+    # 2024-02-04 is a 戊戌 day; 23:00-24:00 is the 子时 of the next (己) day
+    assert _bazi(service, "2024-02-04T22:30") == "甲辰 丙寅 戊戌 癸亥"
+    assert _bazi(service, "2024-02-04T23:30") == "甲辰 丙寅 戊戌 甲子"
+    assert _bazi(service, "2024-02-05T00:30") == "甲辰 丙寅 己亥 甲子"
+
+
+def test_four_pillars_batch_uses_pool_in_order(service):
+    datetimes = [datetime(2024, 2, 4, 16, 0) + timedelta(minutes=minute) for minute in range(BAZI_CHUNK_SIZE + 1)]
+    try:
+        results = asyncio.run(service.get_four_pillars_batch(datetimes, "zh_CN"))
+    finally:
+        calendar_service.shutdown_bazi_pool()
+    assert results == service.get_four_pillars(datetimes, "zh_CN")
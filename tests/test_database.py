@@ -0,0 +1,83 @@
+"""Read-replica routing, exercised with a primary and a replica as two SQLite files"""
+from datetime import date, datetime
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, lambda_stmt, select
+
+from doonook_chinese_calendar.core import database
+from doonook_chinese_calendar.models.calendar import DailyCalendar
+from doonook_chinese_calendar.services.calendar_service import ChineseCalendarService
+
+DAY = date(2024, 2, 10)
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        DailyCalendar.__table__.create(engine)
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "_replica_cycle", iter([replica] * 10))
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _insert(engine, day: date, lunar_date: str):
+    with engine.begin() as conn:
+        conn.execute(DailyCalendar.__table__.insert().values(date=day, lunar_date=lunar_date))
+
+
+def _session():
+    return database.RoutingSession(bind=database.engine)
+
+
+def test_selects_read_from_replica(engines):
+    primary, replica = engines
+    _insert(replica, DAY, "replica")
+    with _session() as db:
+        row = db.execute(select(DailyCalendar).where(DailyCalendar.date == DAY)).scalar_one()
+        assert row.lunar_date == "replica"
+        assert not db.use_primary
+
+
+def test_lambda_statements_read_from_replica(engines):
+    primary, replica = engines
+    _insert(replica, DAY, "replica")
+    with _session() as db:
+        row = db.execute(lambda_stmt(lambda: select(DailyCalendar).where(DailyCalendar.date == DAY))).scalar_one()
+        assert row.lunar_date == "replica"
+        assert not db.use_primary
+
+
+def test_writes_pin_session_to_primary(engines):
+    primary, replica = engines
+    with _session() as db:
+        db.add(DailyCalendar(date=DAY, lunar_date="written"))
+        db.commit()
+        assert db.use_primary
+        # Reads its own write even though the replica has not caught up
+        row = db.execute(select(DailyCalendar).where(DailyCalendar.date == DAY)).scalar_one()
+        assert row.lunar_date == "written"
+    with replica.connect() as conn:
+        assert conn.execute(select(DailyCalendar)).first() is None
+
+
+def test_switch_to_primary_only_once(engines):
+    with _session() as db:
+        assert database.switch_to_primary(db)
+        assert not database.switch_to_primary(db)
+
+
+def test_daily_calendar_retries_replica_miss_on_primary(engines):
+    primary, replica = engines
+    _insert(primary, DAY, "primary")
+    service = ChineseCalendarService()
+    with _session() as db:
+        result = asyncio.run(service.get_daily_calendar(
+            datetime(DAY.year, DAY.month, DAY.day), db, {"date", "lunar_date"}, lang="zh_CN"
+        ))
+        assert result == {"date": "2024-02-10", "lunar_date": "primary"}
+        assert db.use_primary
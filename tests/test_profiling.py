@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pyinstrument import Profiler
+
+from doonook_chinese_calendar import create_calendar_router
+from doonook_chinese_calendar.api.endpoints import router as calendar_router
+from doonook_chinese_calendar.core.config import CalendarSettings
+from doonook_chinese_calendar.core.profiling import PROFILE_HEADER, ProfilingRoute, summarize
+
+TOKEN = "profile-me"
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _work() -> None:
+    _busy(0.02)
+    await asyncio.sleep(0.02)
+    _busy(0.02)
+
+
+def test_summary_adds_up_to_profiled_time():
+    profiler = Profiler(interval=0.001, async_mode="enabled")
+    profiler.start()
+    asyncio.run(_work())
+    profiler.stop()
+
+    session = profiler.last_session
+    root_frame = session.root_frame()
+    totals = summarize(root_frame)
+    assert sum(totals.values()) == pytest.approx(root_frame.time)
+    assert sum(totals.values()) <= session.duration * 1.05
+
+
+def _client(profiling: bool) -> TestClient:
+    settings = CalendarSettings(PROFILING_ENABLED=profiling, PROFILING_TOKEN=TOKEN if profiling else None)
+    app = FastAPI()
+    app.include_router(create_calendar_router(settings, prefix=""))
+    return TestClient(app)
+
+
+def test_profiled_request_reports_consistent_breakdown():
+    response = _client(True).get("/convert-to-lunar", params={"date": "2024-02-10"}, headers={PROFILE_HEADER: TOKEN})
+    assert response.status_code == 200
+    total_ms = float(response.headers["X-Profile-Total-Ms"])
+    breakdown_ms = sum(
+        float(part.split("=")[1].removesuffix("ms"))
+        for part in response.headers["X-Profile-Breakdown"].split("; ") if part
+    )
+    assert breakdown_ms <= total_ms * 1.05 + 0.5
+
+
+def test_requests_without_token_are_not_profiled():
+    response = _client(True).get("/convert-to-lunar", params={"date": "2024-02-10"}, headers={PROFILE_HEADER: "wrong"})
+    assert response.status_code == 200
+    assert "X-Profile-Total-Ms" not in response.headers
+
+
+def test_profiling_does_not_leak_into_other_routers():
+    _client(True)
+    assert not any(isinstance(route, ProfilingRoute) for route in calendar_router.routes)
+    response = _client(False).get("/convert-to-lunar", params={"date": "2024-02-10"}, headers={PROFILE_HEADER: TOKEN})
+    assert response.status_code == 200
+    assert "X-Profile-Total-Ms" not in response.headers
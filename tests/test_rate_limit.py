@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from doonook_chinese_calendar.api import endpoints
+from doonook_chinese_calendar.core.rate_limit import LocalBucketBackend, QuotaExceededError, RateLimiter
+
+
+def _limiter(daily_quota):
+    return RateLimiter("test", rate=1000.0, burst=1000, daily_quota=daily_quota, backend=LocalBucketBackend())
+
+
+def test_quota_is_enforced():
+    limiter = _limiter(2)
+
+    async def calls():
+        await limiter.acquire()
+        await limiter.acquire()
+        with pytest.raises(QuotaExceededError):
+            await limiter.acquire()
+        return await limiter.usage()
+
+    assert asyncio.run(calls())["used"] == 2
+
+
+def test_zero_quota_blocks_every_call():
+    with pytest.raises(QuotaExceededError):
+        asyncio.run(_limiter(0).acquire())
+
+
+def test_no_quota_is_unlimited():
+    limiter = _limiter(None)
+
+    async def calls():
+        for _ in range(50):
+            await limiter.acquire()
+        return await limiter.usage()
+
+    assert asyncio.run(calls())["used"] == 50
+
+
+def test_cancelled_waiter_refunds_its_reservation():
+    limiter = RateLimiter("test", rate=0.001, burst=1, daily_quota=5, backend=LocalBucketBackend())
+
+    async def calls():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await limiter.usage()
+
+    assert asyncio.run(calls())["used"] == 1
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(endpoints.router)
+    return TestClient(app)
+
+
+def test_quota_usage_hidden_without_token(client, monkeypatch):
+    monkeypatch.setattr(endpoints.settings, "QUOTA_USAGE_TOKEN", None)
+    assert client.get("/quota-usage", headers={"X-Doonook-Admin-Token": ""}).status_code == 404
+
+
+def test_quota_usage_requires_matching_token(client, monkeypatch):
+    monkeypatch.setattr(endpoints.settings, "QUOTA_USAGE_TOKEN", "secret")
+    assert client.get("/quota-usage").status_code == 404
+    assert client.get("/quota-usage", headers={"X-Doonook-Admin-Token": "wrong"}).status_code == 404
+    response = client.get("/quota-usage", headers={"X-Doonook-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"jisu", "juhe"}